@@ -15,6 +15,26 @@ class DocumentProcessor {
     private $allowed_types;
     private $max_file_size;
     
+    /**
+     * Keyword rules for document classification, checked in order
+     */
+    private const CLASSIFICATION_RULES = [
+        ['type' => DOC_TYPE_MEDICAL_RECORD, 'confidence' => 0.85, 'keywords' => ['medical record', 'patient', 'diagnosis']],
+        ['type' => DOC_TYPE_POLICE_REPORT, 'confidence' => 0.80, 'keywords' => ['police report', 'incident report', 'officer']],
+        ['type' => DOC_TYPE_INSURANCE_DOC, 'confidence' => 0.75, 'keywords' => ['insurance', 'claim', 'policy']],
+        ['type' => DOC_TYPE_BILL_INVOICE, 'confidence' => 0.70, 'keywords' => ['invoice', 'bill', 'amount due']]
+    ];
+    
+    /**
+     * Regex patterns for structured data extraction (simple patterns)
+     */
+    private const EXTRACTION_PATTERNS = [
+        'dates' => ['pattern' => '/\b\d{1,2}\/\d{1,2}\/\d{4}\b/', 'group' => 0],
+        'amounts' => ['pattern' => '/\$\d{1,3}(?:,\d{3})*(?:\.\d{2})?/', 'group' => 0],
+        'parties' => ['pattern' => '/(?:Dr\.|Mr\.|Mrs\.|Ms\.)\s+([A-Z][a-z]+\s+[A-Z][a-z]+)/', 'group' => 1],
+        'phones' => ['pattern' => '/\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}/', 'group' => 0]
+    ];
+    
     public function __construct() {
         $this->db = new Database();
         $this->upload_path = UPLOAD_PATH;
@@ -285,21 +305,11 @@ class DocumentProcessor {
             'addresses' => []
         ];
         
-        // Extract dates (simple regex patterns)
-        preg_match_all('/\b\d{1,2}\/\d{1,2}\/\d{4}\b/', $ocr_text, $date_matches);
-        $extracted['dates'] = array_unique($date_matches[0]);
-        
-        // Extract dollar amounts
-        preg_match_all('/\$\d{1,3}(?:,\d{3})*(?:\.\d{2})?/', $ocr_text, $amount_matches);
-        $extracted['amounts'] = array_unique($amount_matches[0]);
-        
-        // Extract names (basic pattern)
-        preg_match_all('/(?:Dr\.|Mr\.|Mrs\.|Ms\.)\s+([A-Z][a-z]+\s+[A-Z][a-z]+)/', $ocr_text, $name_matches);
-        $extracted['parties'] = array_unique($name_matches[1]);
-        
-        // Extract phone numbers
-        preg_match_all('/\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}/', $ocr_text, $phone_matches);
-        $extracted['phones'] = array_unique($phone_matches[0]);
+        // Extract dates, dollar amounts, names and phone numbers
+        foreach (self::EXTRACTION_PATTERNS as $field => $rule) {
+            preg_match_all($rule['pattern'], $ocr_text, $matches);
+            $extracted[$field] = array_values(array_unique($matches[$rule['group']]));
+        }
         
         return $extracted;
     }
@@ -424,31 +434,24 @@ class DocumentProcessor {
             return false;
         }
         
-        $ocr_text = strtolower($content['ocr_text']);
+        $ocr_text = $content['ocr_text'];
         $classification = DOC_TYPE_OTHER;
         $confidence = 0.0;
         
-        // Simple rule-based classification
-        if (strpos($ocr_text, 'medical record') !== false || 
-            strpos($ocr_text, 'patient') !== false ||
-            strpos($ocr_text, 'diagnosis') !== false) {
-            $classification = DOC_TYPE_MEDICAL_RECORD;
-            $confidence = 0.85;
-        } elseif (strpos($ocr_text, 'police report') !== false ||
-                  strpos($ocr_text, 'incident report') !== false ||
-                  strpos($ocr_text, 'officer') !== false) {
-            $classification = DOC_TYPE_POLICE_REPORT;
-            $confidence = 0.80;
-        } elseif (strpos($ocr_text, 'insurance') !== false ||
-                  strpos($ocr_text, 'claim') !== false ||
-                  strpos($ocr_text, 'policy') !== false) {
-            $classification = DOC_TYPE_INSURANCE_DOC;
-            $confidence = 0.75;
-        } elseif (strpos($ocr_text, 'invoice') !== false ||
-                  strpos($ocr_text, 'bill') !== false ||
-                  strpos($ocr_text, 'amount due') !== false) {
-            $classification = DOC_TYPE_BILL_INVOICE;
-            $confidence = 0.70;
+        // Find every rule keyword in a single case-insensitive scan of the text,
+        // lowercasing only the matches instead of copying the whole text
+        preg_match_all($this->getClassificationPattern(), $ocr_text, $keyword_matches);
+        $found = array_flip(array_map('strtolower', $keyword_matches[0]));
+        
+        // Simple rule-based classification (first matching rule wins)
+        foreach (self::CLASSIFICATION_RULES as $rule) {
+            foreach ($rule['keywords'] as $keyword) {
+                if (isset($found[$keyword])) {
+                    $classification = $rule['type'];
+                    $confidence = $rule['confidence'];
+                    break 2;
+                }
+            }
         }
         
         // Update document classification
@@ -459,6 +462,25 @@ class DocumentProcessor {
         return ['type' => $classification, 'confidence' => $confidence];
     }
     
+    /**
+     * Build the combined keyword pattern for classification once per request
+     */
+    private function getClassificationPattern() {
+        static $pattern = null;
+        
+        if ($pattern === null) {
+            $keywords = [];
+            foreach (self::CLASSIFICATION_RULES as $rule) {
+                foreach ($rule['keywords'] as $keyword) {
+                    $keywords[] = preg_quote($keyword, '/');
+                }
+            }
+            $pattern = '/' . implode('|', $keywords) . '/i';
+        }
+        
+        return $pattern;
+    }
+    
     /**
      * Format file size for display
      */